@@ -0,0 +1,39 @@
+"""Add composite and foreign key indexes for hot queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building the
+    # indexes concurrently on PostgreSQL avoids locking populated tables.
+    with op.get_context().autocommit_block():
+        # Composite indexes matching multi-column WHERE / ORDER BY patterns
+        op.create_index('ix_feedback_employee_created', 'feedback', ['employee_id', sa.text('created_at DESC')], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_feedback_manager_sentiment', 'feedback', ['manager_id', 'sentiment'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_users_manager', 'users', ['manager_id'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+        # Foreign key indexes (PostgreSQL does not create these automatically).
+        # feedback.employee_id / feedback.manager_id are covered by the composites above.
+        op.create_index(op.f('ix_feedback_organization_id'), 'feedback', ['organization_id'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.create_index(op.f('ix_users_organization_id'), 'users', ['organization_id'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_users_organization_id'), table_name='users', if_exists=True, postgresql_concurrently=True)
+        op.drop_index(op.f('ix_feedback_organization_id'), table_name='feedback', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_users_manager', table_name='users', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_feedback_manager_sentiment', table_name='feedback', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_feedback_employee_created', table_name='feedback', if_exists=True, postgresql_concurrently=True)
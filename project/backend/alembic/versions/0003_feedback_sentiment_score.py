@@ -0,0 +1,29 @@
+"""Add numeric sentiment_score to feedback
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('feedback', sa.Column('sentiment_score', sa.SmallInteger(), server_default='1', nullable=False))
+
+    # Backfill from the existing sentiment labels (see models.Sentiment)
+    op.execute(
+        "UPDATE feedback SET sentiment_score = CASE sentiment "
+        "WHEN 'positive' THEN 2 WHEN 'neutral' THEN 1 ELSE 0 END"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('feedback', 'sentiment_score')
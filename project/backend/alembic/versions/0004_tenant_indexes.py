@@ -0,0 +1,33 @@
+"""Tenant-prefixed composite indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_feedback_org_manager_employee', 'feedback', ['organization_id', 'manager_id', 'employee_id'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_users_org_manager', 'users', ['organization_id', 'manager_id'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+        # Superseded by the organization_id-prefixed composites above
+        op.drop_index('ix_feedback_organization_id', table_name='feedback', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_users_organization_id', table_name='users', if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_organization_id', 'users', ['organization_id'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_feedback_organization_id', 'feedback', ['organization_id'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_users_org_manager', table_name='users', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_feedback_org_manager_employee', table_name='feedback', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""Partial indexes for pending feedback and invitations
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Unacknowledged feedback per employee
+        op.create_index('ix_feedback_pending', 'feedback', ['employee_id'], unique=False, if_not_exists=True,
+                        postgresql_concurrently=True,
+                        postgresql_where=sa.text('acknowledged = false'),
+                        sqlite_where=sa.text('acknowledged = 0'))
+
+        # Invitations not yet accepted. now() is not immutable, so expiry cannot be
+        # part of the predicate; it is the second index column instead.
+        op.create_index('ix_invitations_pending', 'invitations', ['organization_id', 'expires_at'], unique=False, if_not_exists=True,
+                        postgresql_concurrently=True,
+                        postgresql_where=sa.text('accepted_at IS NULL'),
+                        sqlite_where=sa.text('accepted_at IS NULL'))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_invitations_pending', table_name='invitations', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_feedback_pending', table_name='feedback', if_exists=True, postgresql_concurrently=True)
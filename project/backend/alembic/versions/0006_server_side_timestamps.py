@@ -0,0 +1,70 @@
+"""Server-side, timezone-aware timestamps
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+TIMESTAMP_COLUMNS = {
+    'organizations': ['created_at'],
+    'users': ['created_at', 'last_login'],
+    'invitations': ['expires_at', 'accepted_at', 'created_at'],
+    'feedback': ['created_at', 'updated_at'],
+}
+SERVER_DEFAULT_COLUMNS = {'created_at', 'updated_at'}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # Existing naive values were written with utcnow()
+        for table, columns in TIMESTAMP_COLUMNS.items():
+            for column in columns:
+                default = {'server_default': sa.func.now()} if column in SERVER_DEFAULT_COLUMNS else {}
+                op.alter_column(table, column,
+                                existing_type=sa.DateTime(),
+                                type_=sa.DateTime(timezone=True),
+                                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+                                **default)
+    else:
+        # SQLite has no timezone-aware type; only the defaults change
+        for table, columns in TIMESTAMP_COLUMNS.items():
+            with op.batch_alter_table(table) as batch_op:
+                for column in columns:
+                    if column in SERVER_DEFAULT_COLUMNS:
+                        batch_op.alter_column(column, existing_type=sa.DateTime(),
+                                              server_default=sa.text('(CURRENT_TIMESTAMP)'))
+        _restore_descending_index()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        for table, columns in TIMESTAMP_COLUMNS.items():
+            for column in columns:
+                default = {'server_default': None} if column in SERVER_DEFAULT_COLUMNS else {}
+                op.alter_column(table, column,
+                                existing_type=sa.DateTime(timezone=True),
+                                type_=sa.DateTime(),
+                                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+                                **default)
+    else:
+        for table, columns in TIMESTAMP_COLUMNS.items():
+            with op.batch_alter_table(table) as batch_op:
+                for column in columns:
+                    if column in SERVER_DEFAULT_COLUMNS:
+                        batch_op.alter_column(column, existing_type=sa.DateTime(), server_default=None)
+        _restore_descending_index()
+
+
+def _restore_descending_index() -> None:
+    # Batch mode rebuilds the table from reflection, which drops the DESC ordering
+    op.drop_index('ix_feedback_employee_created', table_name='feedback')
+    op.create_index('ix_feedback_employee_created', 'feedback', ['employee_id', sa.text('created_at DESC')], unique=False)
@@ -0,0 +1,25 @@
+"""Index users by organization and role
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_org_role', 'users', ['organization_id', 'role'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_org_role', table_name='users', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,57 @@
+"""Per-employee feedback summary table
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('employee_feedback_summary',
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.Column('feedback_count', sa.Integer(), nullable=False),
+        sa.Column('sentiment_score_total', sa.Integer(), nullable=False),
+        sa.Column('positive_count', sa.Integer(), nullable=False),
+        sa.Column('neutral_count', sa.Integer(), nullable=False),
+        sa.Column('negative_count', sa.Integer(), nullable=False),
+        sa.Column('last_feedback_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['employee_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+        sa.PrimaryKeyConstraint('employee_id')
+    )
+    op.create_index(op.f('ix_employee_feedback_summary_organization_id'), 'employee_feedback_summary', ['organization_id'], unique=False)
+
+    # Backfill from existing feedback; later inserts are counted by the application
+    op.execute("""
+        INSERT INTO employee_feedback_summary (
+            employee_id, organization_id, feedback_count, sentiment_score_total,
+            positive_count, neutral_count, negative_count, last_feedback_at
+        )
+        SELECT
+            employee_id,
+            MIN(organization_id),
+            COUNT(*),
+            SUM(sentiment_score),
+            SUM(CASE WHEN sentiment = 'positive' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN sentiment = 'neutral' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN sentiment = 'negative' THEN 1 ELSE 0 END),
+            MAX(created_at)
+        FROM feedback
+        WHERE employee_id IS NOT NULL AND organization_id IS NOT NULL
+        GROUP BY employee_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_employee_feedback_summary_organization_id'), table_name='employee_feedback_summary')
+    op.drop_table('employee_feedback_summary')
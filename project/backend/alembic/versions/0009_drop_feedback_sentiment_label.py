@@ -0,0 +1,43 @@
+"""Store feedback sentiment only as its numeric code
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_feedback_manager_sentiment', table_name='feedback', if_exists=True, postgresql_concurrently=True)
+
+    # sentiment_score has been kept in sync with the label since 0003
+    op.drop_column('feedback', 'sentiment')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_feedback_manager_sentiment', 'feedback', ['manager_id', 'sentiment_score'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_feedback_manager_sentiment', table_name='feedback', if_exists=True, postgresql_concurrently=True)
+
+    op.add_column('feedback', sa.Column('sentiment', sa.String(), nullable=True))
+    op.execute("""
+        UPDATE feedback SET sentiment = CASE sentiment_score
+            WHEN 2 THEN 'positive'
+            WHEN 1 THEN 'neutral'
+            ELSE 'negative'
+        END
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_feedback_manager_sentiment', 'feedback', ['manager_id', 'sentiment'], unique=False, if_not_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,48 @@
+"""Store feedback tags as text[] with a GIN index on PostgreSQL
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite keeps tags as JSON
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # USING cannot contain a subquery, so convert through a new column
+    op.add_column('feedback', sa.Column('tags_array', postgresql.ARRAY(sa.Text()), nullable=True))
+    op.execute("""
+        UPDATE feedback SET tags_array = ARRAY(SELECT json_array_elements_text(tags))
+        WHERE json_typeof(tags) = 'array'
+    """)
+    op.drop_column('feedback', 'tags')
+    op.alter_column('feedback', 'tags_array', new_column_name='tags')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_feedback_tags_gin', 'feedback', ['tags'], unique=False, if_not_exists=True,
+                        postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_feedback_tags_gin', table_name='feedback', if_exists=True, postgresql_concurrently=True)
+
+    op.add_column('feedback', sa.Column('tags_json', sa.JSON(), nullable=True))
+    op.execute("UPDATE feedback SET tags_json = to_json(tags)")
+    op.drop_column('feedback', 'tags')
+    op.alter_column('feedback', 'tags_json', new_column_name='tags')
@@ -0,0 +1,26 @@
+"""Fixed-width, non-null invitation tokens
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Batch mode alters in place on PostgreSQL and rebuilds the table on SQLite
+    with op.batch_alter_table('invitations') as batch_op:
+        batch_op.alter_column('token', existing_type=sa.String(), type_=sa.String(length=43), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('invitations') as batch_op:
+        batch_op.alter_column('token', existing_type=sa.String(length=43), type_=sa.String(), nullable=True)
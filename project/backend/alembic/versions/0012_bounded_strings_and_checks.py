@@ -0,0 +1,60 @@
+"""Bound user/invitation string columns and add CHECK constraints
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+ROLE_CHECK = "role IN ('owner', 'admin', 'manager', 'employee')"
+
+
+def upgrade() -> None:
+    # Batch mode alters in place on PostgreSQL and rebuilds the tables on SQLite
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('email', existing_type=sa.String(), type_=sa.String(length=254))
+        batch_op.alter_column('name', existing_type=sa.String(), type_=sa.String(length=120))
+        batch_op.alter_column('role', existing_type=sa.String(), type_=sa.String(length=16), nullable=False)
+        batch_op.create_check_constraint('ck_user_role', ROLE_CHECK)
+
+    with op.batch_alter_table('invitations') as batch_op:
+        batch_op.alter_column('email', existing_type=sa.String(), type_=sa.String(length=254))
+        batch_op.alter_column('role', existing_type=sa.String(), type_=sa.String(length=16), nullable=False)
+        batch_op.create_check_constraint('ck_invitation_role', ROLE_CHECK)
+
+    with op.batch_alter_table('feedback') as batch_op:
+        batch_op.create_check_constraint('ck_feedback_sentiment_score', 'sentiment_score BETWEEN 0 AND 2')
+    _restore_descending_index()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('feedback') as batch_op:
+        batch_op.drop_constraint('ck_feedback_sentiment_score', type_='check')
+    _restore_descending_index()
+
+    with op.batch_alter_table('invitations') as batch_op:
+        batch_op.drop_constraint('ck_invitation_role', type_='check')
+        batch_op.alter_column('role', existing_type=sa.String(length=16), type_=sa.String(), nullable=True)
+        batch_op.alter_column('email', existing_type=sa.String(length=254), type_=sa.String())
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_constraint('ck_user_role', type_='check')
+        batch_op.alter_column('role', existing_type=sa.String(length=16), type_=sa.String(), nullable=True)
+        batch_op.alter_column('name', existing_type=sa.String(length=120), type_=sa.String())
+        batch_op.alter_column('email', existing_type=sa.String(length=254), type_=sa.String())
+
+
+def _restore_descending_index() -> None:
+    # A SQLite batch rebuild recreates indexes from reflection, which drops the DESC ordering
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.drop_index('ix_feedback_employee_created', table_name='feedback')
+    op.create_index('ix_feedback_employee_created', 'feedback', ['employee_id', sa.text('created_at DESC')], unique=False)
@@ -1,114 +1,144 @@
-from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, Request, status, BackgroundTasks
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timedelta
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, undefer
+from sqlalchemy import select, func, exists
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
+from pydantic import ValidationError
+import asyncio
 import os
 
-from database import get_db, create_tables
-from models import User, Organization, Feedback, Invitation
+from cache import (
+    RateLimiter, close_redis,
+    get_cached_sentiment_counts, set_cached_sentiment_counts, invalidate_sentiment_counts,
+)
+from database import get_db, create_tables, prewarm_pool, engine, SessionLocal
+from models import User, Organization, Feedback, Invitation, EmployeeFeedbackSummary
 from schemas import *
 from auth import *
+from middleware import ETagMiddleware
 
 # FastAPI app
-app = FastAPI(title="Multi-Tenant Feedback System API", version="2.0.0")
+app = FastAPI(
+    title="Multi-Tenant Feedback System API",
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # CORS middleware
 allowed_origins = [
     os.getenv("FRONTEND_URL", "http://localhost:3000"),
     "http://localhost:3000",
     "http://localhost:5173",
-    "https://*.vercel.app",
 ]
 
+# Explicit lists let Starlette build constant CORS headers; Vercel previews match by regex
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
+    allow_origin_regex=r"https://[a-z0-9-]+\.vercel\.app",
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+)
+
+# Conditional GETs: unchanged responses come back as 304 without a body
+app.add_middleware(
+    ETagMiddleware,
+    cache_control={"/api/dashboard/stats": "private, max-age=5"},
+)
+
+# Invitation tokens can only be brute-forced, so cap accept attempts per client. Clients are
+# keyed by request.client, so behind a reverse proxy uvicorn must trust its X-Forwarded-For
+# (FORWARDED_ALLOW_IPS / --forwarded-allow-ips) or every user shares the proxy's bucket
+invitation_accept_limiter = RateLimiter(
+    "invitation-accept",
+    limit=int(os.getenv("INVITATION_ACCEPT_RATE_LIMIT", "10")),
+    window_seconds=60,
 )
 
-# Create tables on startup
+# Schema is managed by Alembic; create_all is opt-in for SQLite/local setups
 @app.on_event("startup")
-def startup_event():
-    create_tables()
+async def startup_event():
+    start_password_pool()
+    if os.getenv("AUTO_CREATE_TABLES") == "1":
+        await create_tables()
+    await prewarm_pool()
     # Initialize demo data if needed
-    db = next(get_db())
-    try:
-        init_demo_data(db)
-    finally:
-        db.close()
+    async with SessionLocal() as db:
+        await init_demo_data(db)
 
-def init_demo_data(db: Session):
+@app.on_event("shutdown")
+async def shutdown_event():
+    stop_password_pool()
+    await close_redis()
+    await engine.dispose()
+
+async def init_demo_data(db: AsyncSession):
     """Initialize demo organization and users"""
-    if db.query(Organization).first():
+    if await db.scalar(select(Organization).limit(1)):
         return
     
-    # Create demo organization
+    # Hash the demo passwords in parallel on the password pool
+    owner_hash, manager_hash, employee_hash = await asyncio.gather(
+        *(hash_password_async("password123") for _ in range(3))
+    )
+    
+    # Create demo organization, users and feedback in a single transaction;
+    # relationships let the flush order the inserts and fill in foreign keys
     demo_org = Organization(name="Demo Company", domain="demo.com")
-    db.add(demo_org)
-    db.commit()
-    db.refresh(demo_org)
     
-    # Create demo users
     owner = User(
         email="owner@demo.com",
         name="Organization Owner",
-        password_hash=hash_password("password123"),
+        password_hash=owner_hash,
         role="owner",
-        organization_id=demo_org.id
+        organization=demo_org
     )
-    db.add(owner)
-    db.commit()
-    db.refresh(owner)
     
     manager = User(
         email="manager@demo.com",
         name="Team Manager",
-        password_hash=hash_password("password123"),
+        password_hash=manager_hash,
         role="manager",
-        organization_id=demo_org.id
+        organization=demo_org
     )
-    db.add(manager)
-    db.commit()
-    db.refresh(manager)
     
     employee = User(
         email="employee@demo.com",
         name="Team Employee",
-        password_hash=hash_password("password123"),
+        password_hash=employee_hash,
         role="employee",
-        organization_id=demo_org.id,
-        manager_id=manager.id
+        organization=demo_org,
+        manager=manager
     )
-    db.add(employee)
-    db.commit()
-    db.refresh(employee)
     
     # Create demo feedback
     feedback = Feedback(
-        employee_id=employee.id,
-        manager_id=manager.id,
-        organization_id=demo_org.id,
+        employee=employee,
+        manager=manager,
+        organization=demo_org,
         strengths="Excellent communication skills and always meets deadlines.",
         improvements="Could benefit from taking on more leadership responsibilities.",
         sentiment="positive",
         tags=["communication", "reliability"]
     )
-    db.add(feedback)
-    db.commit()
+    
+    db.add_all([demo_org, owner, manager, employee, feedback])
+    await db.commit()
 
 # Organization endpoints
 @app.post("/api/organizations", response_model=OrganizationResponse)
-def create_organization(
+async def create_organization(
     org_data: OrganizationCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new organization (public endpoint for initial setup)"""
     # Check if organization name already exists
-    existing_org = db.query(Organization).filter(Organization.name == org_data.name).first()
+    existing_org = await db.scalar(select(Organization).where(Organization.name == org_data.name))
     if existing_org:
         raise HTTPException(status_code=400, detail="Organization name already exists")
     
@@ -117,28 +147,27 @@ def create_organization(
         domain=org_data.domain
     )
     db.add(organization)
-    db.commit()
-    db.refresh(organization)
+    await db.commit()
     
     return organization
 
 @app.get("/api/organizations", response_model=List[OrganizationResponse])
-def list_organizations(db: Session = Depends(get_db)):
+async def list_organizations(db: AsyncSession = Depends(get_db)):
     """List all organizations (for login selection)"""
-    organizations = db.query(Organization).filter(Organization.is_active == True).all()
+    organizations = (await db.scalars(select(Organization).where(Organization.is_active == True))).all()
     return organizations
 
 @app.get("/api/organizations/{org_id}", response_model=OrganizationResponse)
-def get_organization(
+async def get_organization(
     org_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get organization details"""
     if current_user.organization_id != org_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    organization = db.query(Organization).filter(Organization.id == org_id).first()
+    organization = await db.scalar(select(Organization).where(Organization.id == org_id))
     if not organization:
         raise HTTPException(status_code=404, detail="Organization not found")
     
@@ -146,124 +175,86 @@ def get_organization(
 
 # Authentication endpoints
 @app.post("/api/auth/register")
-def register_user(
+async def register_user(
     user_data: UserCreate,
     organization_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Register first user as organization owner"""
-    organization = db.query(Organization).filter(Organization.id == organization_id).first()
+    organization = await db.scalar(select(Organization).where(Organization.id == organization_id))
     if not organization:
         raise HTTPException(status_code=404, detail="Organization not found")
     
-    # Check if organization already has users
-    existing_users = db.query(User).filter(User.organization_id == organization_id).count()
-    if existing_users > 0:
+    # Check if organization already has users (which also rules out a duplicate email)
+    if await db.scalar(select(exists().where(User.organization_id == organization_id))):
         raise HTTPException(status_code=400, detail="Organization already has users. Use invitation system.")
     
-    # Check if email already exists in organization
-    existing_user = db.query(User).filter(
-        User.email == user_data.email,
-        User.organization_id == organization_id
-    ).first()
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered in this organization")
-    
     user = User(
         email=user_data.email,
         name=user_data.name,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password_async(user_data.password),
         role="owner",  # First user becomes owner
         organization_id=organization_id
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     
     access_token = create_access_token(data={"sub": user.id})
     return {
         "token": access_token,
-        "user": UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            role=user.role,
-            organization_id=user.organization_id,
-            manager_id=user.manager_id,
-            is_active=user.is_active,
-            last_login=user.last_login
-        )
+        "user": UserResponse.from_orm_trusted(user)
     }
 
 @app.post("/api/auth/login")
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login user"""
-    query = db.query(User).filter(User.email == user_data.email, User.is_active == True)
+    stmt = select(User).options(undefer(User.password_hash)).where(User.email == user_data.email, User.is_active == True)
     
     if user_data.organization_id:
-        query = query.filter(User.organization_id == user_data.organization_id)
+        stmt = stmt.where(User.organization_id == user_data.organization_id)
     
-    user = query.first()
-    if not user or not verify_password(user_data.password, user.password_hash):
+    user = await db.scalar(stmt.limit(1))
+    if not user or not await verify_password_async(user_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
+    # Transparently upgrade bcrypt / outdated argon2 hashes
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(user_data.password)
+        await db.commit()
+    
     access_token = create_access_token(data={"sub": user.id})
     return {
         "token": access_token,
-        "user": UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            role=user.role,
-            organization_id=user.organization_id,
-            manager_id=user.manager_id,
-            is_active=user.is_active,
-            last_login=user.last_login
-        )
+        "user": UserResponse.from_orm_trusted(user)
     }
 
 @app.get("/api/auth/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
-    return UserResponse(
-        id=current_user.id,
-        email=current_user.email,
-        name=current_user.name,
-        role=current_user.role,
-        organization_id=current_user.organization_id,
-        manager_id=current_user.manager_id,
-        is_active=current_user.is_active,
-        last_login=current_user.last_login
-    )
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
+    return current_user
 
 # User management endpoints
 @app.get("/api/users", response_model=List[UserResponse])
-def list_users(
+async def list_users(
     current_user: User = Depends(require_role(['owner', 'admin'])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all users in organization"""
-    users = db.query(User).filter(User.organization_id == current_user.organization_id).all()
-    return [UserResponse(
-        id=user.id,
-        email=user.email,
-        name=user.name,
-        role=user.role,
-        organization_id=user.organization_id,
-        manager_id=user.manager_id,
-        is_active=user.is_active,
-        last_login=user.last_login
-    ) for user in users]
+    users = (await db.scalars(select(User).where(User.organization_id == current_user.organization_id))).all()
+    # List endpoints build their models without validation and return encoded bytes, so FastAPI
+    # doesn't re-validate against response_model (kept for the docs)
+    users = [UserResponse.from_orm_trusted(user) for user in users]
+    return Response(UserResponseListAdapter.dump_json(users), media_type="application/json")
 
 @app.put("/api/users/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int,
     user_data: UserUpdate,
     current_user: User = Depends(require_role(['owner', 'admin'])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update user details"""
-    target_user = require_same_organization(user_id, current_user, db)
+    target_user = await require_same_organization(user_id, current_user, db)
     
     if user_data.name is not None:
         target_user.name = user_data.name
@@ -272,49 +263,40 @@ def update_user(
     if user_data.manager_id is not None:
         # Verify manager is in same organization
         if user_data.manager_id:
-            require_same_organization(user_data.manager_id, current_user, db)
+            await require_same_organization(user_data.manager_id, current_user, db)
         target_user.manager_id = user_data.manager_id
     if user_data.is_active is not None:
         target_user.is_active = user_data.is_active
     
-    db.commit()
-    db.refresh(target_user)
-    
-    return UserResponse(
-        id=target_user.id,
-        email=target_user.email,
-        name=target_user.name,
-        role=target_user.role,
-        organization_id=target_user.organization_id,
-        manager_id=target_user.manager_id,
-        is_active=target_user.is_active,
-        last_login=target_user.last_login
-    )
+    await db.commit()
+    await invalidate_cached_user(target_user.id)
+    
+    return target_user
 
 # Invitation endpoints
 @app.post("/api/invitations", response_model=InvitationResponse)
-def create_invitation(
+async def create_invitation(
     invitation_data: InvitationCreate,
     current_user: User = Depends(require_role(['owner', 'admin', 'manager'])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create user invitation"""
-    # Check if user already exists in organization
-    existing_user = db.query(User).filter(
-        User.email == invitation_data.email,
-        User.organization_id == current_user.organization_id
-    ).first()
-    if existing_user:
+    # Check for an existing user and an active invitation in one round-trip
+    existing = (await db.execute(select(
+        exists().where(
+            User.email == invitation_data.email,
+            User.organization_id == current_user.organization_id
+        ).label("user"),
+        exists().where(
+            Invitation.email == invitation_data.email,
+            Invitation.organization_id == current_user.organization_id,
+            Invitation.accepted_at.is_(None),
+            Invitation.expires_at > func.now()
+        ).label("invitation")
+    ))).one()
+    if existing.user:
         raise HTTPException(status_code=400, detail="User already exists in organization")
-    
-    # Check if invitation already exists
-    existing_invitation = db.query(Invitation).filter(
-        Invitation.email == invitation_data.email,
-        Invitation.organization_id == current_user.organization_id,
-        Invitation.accepted_at.is_(None),
-        Invitation.expires_at > datetime.utcnow()
-    ).first()
-    if existing_invitation:
+    if existing.invitation:
         raise HTTPException(status_code=400, detail="Active invitation already exists for this email")
     
     invitation = Invitation(
@@ -323,14 +305,14 @@ def create_invitation(
         invited_by_id=current_user.id,
         role=invitation_data.role,
         token=generate_invitation_token(),
-        expires_at=datetime.utcnow() + timedelta(days=7)
+        expires_at=datetime.now(timezone.utc) + timedelta(days=7)
     )
     
     db.add(invitation)
-    db.commit()
-    db.refresh(invitation)
+    await db.commit()
     
-    return InvitationResponse(
+    # Returned as a Response so FastAPI doesn't re-validate it against response_model (kept for the docs)
+    response = InvitationResponse.model_construct(
         id=invitation.id,
         email=invitation.email,
         role=invitation.role,
@@ -339,49 +321,50 @@ def create_invitation(
         created_at=invitation.created_at,
         invited_by_name=current_user.name
     )
+    return Response(response.model_dump_json(), media_type="application/json")
 
 @app.get("/api/invitations", response_model=List[InvitationResponse])
-def list_invitations(
+async def list_invitations(
     current_user: User = Depends(require_role(['owner', 'admin'])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List pending invitations"""
-    invitations = db.query(Invitation).filter(
+    invitations = (await db.scalars(select(Invitation).options(
+        joinedload(Invitation.invited_by)
+    ).where(
         Invitation.organization_id == current_user.organization_id,
         Invitation.accepted_at.is_(None),
-        Invitation.expires_at > datetime.utcnow()
-    ).all()
-    
-    return [InvitationResponse(
-        id=inv.id,
-        email=inv.email,
-        role=inv.role,
-        expires_at=inv.expires_at,
-        accepted_at=inv.accepted_at,
-        created_at=inv.created_at,
-        invited_by_name=inv.invited_by.name
-    ) for inv in invitations]
+        Invitation.expires_at > func.now()
+    ))).all()
+    
+    invitations = [InvitationResponse.from_orm_trusted(invitation) for invitation in invitations]
+    return Response(InvitationResponseListAdapter.dump_json(invitations), media_type="application/json")
 
 @app.post("/api/invitations/accept")
-def accept_invitation(
+async def accept_invitation(
     acceptance_data: InvitationAccept,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """Accept invitation and create user account"""
-    invitation = db.query(Invitation).filter(
+    client = request.client.host if request.client else "unknown"
+    if not await invitation_accept_limiter.hit(client):
+        raise HTTPException(status_code=429, detail="Too many attempts, please try again later")
+    
+    invitation = await db.scalar(select(Invitation).where(
         Invitation.token == acceptance_data.token,
         Invitation.accepted_at.is_(None),
-        Invitation.expires_at > datetime.utcnow()
-    ).first()
+        Invitation.expires_at > func.now()
+    ))
     
     if not invitation:
         raise HTTPException(status_code=400, detail="Invalid or expired invitation")
     
     # Check if user already exists
-    existing_user = db.query(User).filter(
+    existing_user = await db.scalar(select(User).where(
         User.email == invitation.email,
         User.organization_id == invitation.organization_id
-    ).first()
+    ))
     if existing_user:
         raise HTTPException(status_code=400, detail="User already exists")
     
@@ -389,7 +372,7 @@ def accept_invitation(
     user = User(
         email=invitation.email,
         name=acceptance_data.name,
-        password_hash=hash_password(acceptance_data.password),
+        password_hash=await hash_password_async(acceptance_data.password),
         role=invitation.role,
         organization_id=invitation.organization_id
     )
@@ -397,100 +380,67 @@ def accept_invitation(
     db.add(user)
     
     # Mark invitation as accepted
-    invitation.accepted_at = datetime.utcnow()
+    invitation.accepted_at = datetime.now(timezone.utc)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     
     access_token = create_access_token(data={"sub": user.id})
     return {
         "token": access_token,
-        "user": UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            role=user.role,
-            organization_id=user.organization_id,
-            manager_id=user.manager_id,
-            is_active=user.is_active,
-            last_login=user.last_login
-        )
+        "user": UserResponse.from_orm_trusted(user)
     }
 
 # Employee endpoints
 @app.get("/api/employees", response_model=List[EmployeeResponse])
-def get_employees(
+async def get_employees(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get employees based on user role"""
+    # Feedback stats come from the per-employee summary, so no feedback rows are scanned
+    stmt = select(
+        User.id,
+        User.name,
+        User.email,
+        User.role,
+        User.is_active,
+        func.coalesce(EmployeeFeedbackSummary.feedback_count, 0).label("feedback_count"),
+        EmployeeFeedbackSummary.last_feedback_at.label("last_feedback_date"),
+        # sentiment_score is 0-2; employees without feedback default to a neutral 0.5
+        func.coalesce(
+            EmployeeFeedbackSummary.sentiment_score_total / (EmployeeFeedbackSummary.feedback_count * 2.0), 0.5
+        ).label("avg_sentiment")
+    ).outerjoin(EmployeeFeedbackSummary, EmployeeFeedbackSummary.employee_id == User.id)
+    
     if current_user.role in ['owner', 'admin']:
         # Get all employees in organization
-        employees = db.query(User).filter(
+        stmt = stmt.where(
             User.organization_id == current_user.organization_id,
             User.role == 'employee'
-        ).all()
+        )
     elif current_user.role == 'manager':
         # Get direct reports
-        employees = db.query(User).filter(
+        stmt = stmt.where(
             User.manager_id == current_user.id,
             User.organization_id == current_user.organization_id
-        ).all()
+        )
     else:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    result = []
-    for employee in employees:
-        feedback_count = db.query(Feedback).filter(
-            Feedback.employee_id == employee.id,
-            Feedback.organization_id == current_user.organization_id
-        ).count()
-        
-        last_feedback = db.query(Feedback).filter(
-            Feedback.employee_id == employee.id,
-            Feedback.organization_id == current_user.organization_id
-        ).order_by(Feedback.created_at.desc()).first()
-        
-        # Calculate average sentiment
-        feedbacks = db.query(Feedback).filter(
-            Feedback.employee_id == employee.id,
-            Feedback.organization_id == current_user.organization_id
-        ).all()
-        
-        sentiment_scores = []
-        for f in feedbacks:
-            if f.sentiment == "positive":
-                sentiment_scores.append(1.0)
-            elif f.sentiment == "neutral":
-                sentiment_scores.append(0.5)
-            else:
-                sentiment_scores.append(0.0)
-        
-        avg_sentiment = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0.5
-        
-        result.append(EmployeeResponse(
-            id=employee.id,
-            name=employee.name,
-            email=employee.email,
-            role=employee.role,
-            is_active=employee.is_active,
-            feedback_count=feedback_count,
-            last_feedback_date=last_feedback.created_at if last_feedback else None,
-            avg_sentiment=avg_sentiment
-        ))
-    
-    return result
+    rows = await db.execute(stmt)
+    employees = [dict(row) for row in rows.mappings()]
+    return Response(EmployeeResponseListAdapter.dump_json(employees), media_type="application/json")
 
 # Feedback endpoints (updated with organization filtering)
 @app.post("/api/feedback")
-def create_feedback(
+async def create_feedback(
     feedback_data: FeedbackCreate,
     current_user: User = Depends(require_role(['manager', 'admin', 'owner'])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create feedback"""
     # Verify employee is in same organization
-    employee = require_same_organization(feedback_data.employee_id, current_user, db)
+    employee = await require_same_organization(feedback_data.employee_id, current_user, db)
     
     # Verify manager can give feedback to this employee
     if current_user.role == 'manager' and employee.manager_id != current_user.id:
@@ -507,85 +457,112 @@ def create_feedback(
     )
     
     db.add(feedback)
-    db.commit()
-    db.refresh(feedback)
+    await db.commit()
+    await invalidate_sentiment_counts(current_user.organization_id)
     
     return {"message": "Feedback created successfully", "id": feedback.id}
 
+# The body is read raw (see below), so describe it for OpenAPI by hand
+_FEEDBACK_BULK_SCHEMA = FeedbackCreateListAdapter.json_schema(ref_template="#/components/schemas/{model}")
+_FEEDBACK_BULK_SCHEMA.pop("$defs", None)
+
+@app.post("/api/feedback/bulk", openapi_extra={
+    "requestBody": {"required": True, "content": {"application/json": {"schema": _FEEDBACK_BULK_SCHEMA}}}
+})
+async def create_feedback_bulk(
+    request: Request,
+    current_user: User = Depends(require_role(['manager', 'admin', 'owner'])),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many feedback entries from a JSON array of FeedbackCreate objects"""
+    try:
+        items = FeedbackCreateListAdapter.validate_json(await request.body())
+    except ValidationError as e:
+        # Same error locations as FastAPI's own body validation
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+    if not items:
+        return {"message": "No feedback to create", "ids": []}
+    
+    # One lookup for every referenced employee instead of one per item
+    employee_ids = {item.employee_id for item in items}
+    employees = (await db.scalars(select(User).where(
+        User.id.in_(employee_ids),
+        User.organization_id == current_user.organization_id
+    ))).all()
+    if len(employees) != len(employee_ids):
+        raise HTTPException(status_code=403, detail="Access denied to user from different organization")
+    if current_user.role == 'manager' and any(employee.manager_id != current_user.id for employee in employees):
+        raise HTTPException(status_code=403, detail="You can only give feedback to your direct reports")
+    
+    feedback = [
+        Feedback(
+            employee_id=item.employee_id,
+            manager_id=current_user.id,
+            organization_id=current_user.organization_id,
+            strengths=item.strengths,
+            improvements=item.improvements,
+            sentiment=item.sentiment,
+            tags=item.tags
+        )
+        for item in items
+    ]
+    db.add_all(feedback)
+    await db.commit()
+    await invalidate_sentiment_counts(current_user.organization_id)
+    
+    return {"message": f"{len(feedback)} feedback entries created", "ids": [entry.id for entry in feedback]}
+
 @app.get("/api/feedback/{feedback_id}", response_model=FeedbackResponse)
-def get_feedback(
+async def get_feedback(
     feedback_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get specific feedback"""
-    feedback = db.query(Feedback).filter(
+    feedback = await db.scalar(select(Feedback).options(
+        joinedload(Feedback.employee),
+        joinedload(Feedback.manager)
+    ).where(
         Feedback.id == feedback_id,
         Feedback.organization_id == current_user.organization_id
-    ).first()
+    ))
     
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
     
     # Check permissions
     if (current_user.role == 'employee' and feedback.employee_id != current_user.id) or \
-       (current_user.role == 'manager' and feedback.manager_id != current_user.id and feedback.employee_id not in [e.id for e in current_user.employees]):
+       (current_user.role == 'manager' and feedback.manager_id != current_user.id and feedback.employee.manager_id != current_user.id):
         raise HTTPException(status_code=403, detail="Access denied")
     
-    return FeedbackResponse(
-        id=feedback.id,
-        employee_id=feedback.employee_id,
-        manager_id=feedback.manager_id,
-        organization_id=feedback.organization_id,
-        strengths=feedback.strengths,
-        improvements=feedback.improvements,
-        sentiment=feedback.sentiment,
-        tags=feedback.tags or [],
-        acknowledged=feedback.acknowledged,
-        employee_comment=feedback.employee_comment,
-        created_at=feedback.created_at,
-        updated_at=feedback.updated_at,
-        employee_name=feedback.employee.name,
-        manager_name=feedback.manager.name
-    )
+    return feedback
 
 @app.get("/api/feedback/received", response_model=List[FeedbackResponse])
-def get_received_feedback(
+async def get_received_feedback(
     current_user: User = Depends(require_role(['employee'])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get feedback received by current user"""
-    feedbacks = db.query(Feedback).filter(
+    feedbacks = (await db.scalars(select(Feedback).options(
+        joinedload(Feedback.employee),
+        joinedload(Feedback.manager)
+    ).where(
         Feedback.employee_id == current_user.id,
         Feedback.organization_id == current_user.organization_id
-    ).order_by(Feedback.created_at.desc()).all()
-    
-    return [FeedbackResponse(
-        id=f.id,
-        employee_id=f.employee_id,
-        manager_id=f.manager_id,
-        organization_id=f.organization_id,
-        strengths=f.strengths,
-        improvements=f.improvements,
-        sentiment=f.sentiment,
-        tags=f.tags or [],
-        acknowledged=f.acknowledged,
-        employee_comment=f.employee_comment,
-        created_at=f.created_at,
-        updated_at=f.updated_at,
-        employee_name=f.employee.name,
-        manager_name=f.manager.name
-    ) for f in feedbacks]
+    ).order_by(Feedback.created_at.desc()))).all()
+    
+    feedbacks = [FeedbackResponse.from_orm_trusted(feedback) for feedback in feedbacks]
+    return Response(FeedbackResponseListAdapter.dump_json(feedbacks), media_type="application/json")
 
 @app.get("/api/feedback/employee/{employee_id}", response_model=List[FeedbackResponse])
-def get_employee_feedback(
+async def get_employee_feedback(
     employee_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all feedback for specific employee"""
     # Verify employee is in same organization
-    employee = require_same_organization(employee_id, current_user, db)
+    employee = await require_same_organization(employee_id, current_user, db)
     
     # Check permissions
     if current_user.role == 'employee' and employee_id != current_user.id:
@@ -593,123 +570,124 @@ def get_employee_feedback(
     elif current_user.role == 'manager' and employee.manager_id != current_user.id:
         raise HTTPException(status_code=403, detail="You can only view feedback for your direct reports")
     
-    feedbacks = db.query(Feedback).filter(
+    feedbacks = (await db.scalars(select(Feedback).options(
+        joinedload(Feedback.employee),
+        joinedload(Feedback.manager)
+    ).where(
         Feedback.employee_id == employee_id,
         Feedback.organization_id == current_user.organization_id
-    ).order_by(Feedback.created_at.desc()).all()
-    
-    return [FeedbackResponse(
-        id=f.id,
-        employee_id=f.employee_id,
-        manager_id=f.manager_id,
-        organization_id=f.organization_id,
-        strengths=f.strengths,
-        improvements=f.improvements,
-        sentiment=f.sentiment,
-        tags=f.tags or [],
-        acknowledged=f.acknowledged,
-        employee_comment=f.employee_comment,
-        created_at=f.created_at,
-        updated_at=f.updated_at,
-        employee_name=f.employee.name,
-        manager_name=f.manager.name
-    ) for f in feedbacks]
+    ).order_by(Feedback.created_at.desc()))).all()
+    
+    feedbacks = [FeedbackResponse.from_orm_trusted(feedback) for feedback in feedbacks]
+    return Response(FeedbackResponseListAdapter.dump_json(feedbacks), media_type="application/json")
 
 @app.post("/api/feedback/{feedback_id}/acknowledge")
-def acknowledge_feedback(
+async def acknowledge_feedback(
     feedback_id: int,
     current_user: User = Depends(require_role(['employee'])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Acknowledge feedback"""
-    feedback = db.query(Feedback).filter(
+    feedback = await db.scalar(select(Feedback).where(
         Feedback.id == feedback_id,
         Feedback.employee_id == current_user.id,
         Feedback.organization_id == current_user.organization_id
-    ).first()
+    ))
     
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
     
     feedback.acknowledged = True
-    db.commit()
+    await db.commit()
     return {"message": "Feedback acknowledged successfully"}
 
 @app.post("/api/feedback/{feedback_id}/comment")
-def add_comment(
+async def add_comment(
     feedback_id: int,
     comment_data: CommentCreate,
     current_user: User = Depends(require_role(['employee'])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Add comment to feedback"""
-    feedback = db.query(Feedback).filter(
+    feedback = await db.scalar(select(Feedback).where(
         Feedback.id == feedback_id,
         Feedback.employee_id == current_user.id,
         Feedback.organization_id == current_user.organization_id
-    ).first()
+    ))
     
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
     
     feedback.employee_comment = comment_data.comment
-    feedback.updated_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     return {"message": "Comment added successfully"}
 
 @app.get("/api/dashboard/stats", response_model=DashboardStats)
-def get_dashboard_stats(
+async def get_dashboard_stats(
     current_user: User = Depends(require_role(['manager', 'admin', 'owner'])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get dashboard statistics"""
     if current_user.role in ['owner', 'admin']:
         # Organization-wide stats
-        total_employees = db.query(User).filter(
+        employees_filter = (
             User.organization_id == current_user.organization_id,
             User.role == 'employee'
-        ).count()
-        
-        total_feedback = db.query(Feedback).filter(
-            Feedback.organization_id == current_user.organization_id
-        ).count()
+        )
+        feedback_filter = (
+            Feedback.organization_id == current_user.organization_id,
+        )
     else:
         # Manager stats for their team
-        total_employees = db.query(User).filter(
+        employees_filter = (
             User.manager_id == current_user.id,
             User.organization_id == current_user.organization_id
-        ).count()
-        
-        total_feedback = db.query(Feedback).filter(
+        )
+        feedback_filter = (
             Feedback.manager_id == current_user.id,
             Feedback.organization_id == current_user.organization_id
-        ).count()
-    
-    # Pending invitations
-    pending_invitations = db.query(Invitation).filter(
-        Invitation.organization_id == current_user.organization_id,
-        Invitation.accepted_at.is_(None),
-        Invitation.expires_at > datetime.utcnow()
-    ).count()
-    
-    # Sentiment distribution
-    feedbacks = db.query(Feedback).filter(
-        Feedback.organization_id == current_user.organization_id
-    ).all()
+        )
     
-    sentiment_dist = {"positive": 0, "neutral": 0, "negative": 0}
-    for feedback in feedbacks:
-        sentiment_dist[feedback.sentiment] += 1
+    # All counts as scalar subqueries of one statement: one round-trip, one snapshot
+    counts = {
+        "total_employees": select(func.count()).select_from(User).where(*employees_filter),
+        "total_feedback": select(func.count()).select_from(Feedback).where(*feedback_filter),
+        # Pending invitations
+        "pending_invitations": select(func.count()).select_from(Invitation).where(
+            Invitation.organization_id == current_user.organization_id,
+            Invitation.accepted_at.is_(None),
+            Invitation.expires_at > func.now()
+        ),
+    }
+    # Sentiment distribution: Redis when cached, otherwise summed from the per-employee summary
+    sentiment_distribution, sentiment_version = await get_cached_sentiment_counts(current_user.organization_id)
+    if sentiment_distribution is None:
+        for sentiment in ("positive", "neutral", "negative"):
+            counts[sentiment] = select(
+                func.coalesce(func.sum(getattr(EmployeeFeedbackSummary, f"{sentiment}_count")), 0)
+            ).where(EmployeeFeedbackSummary.organization_id == current_user.organization_id)
+    
+    row = (await db.execute(select(*[
+        stmt.scalar_subquery().label(name) for name, stmt in counts.items()
+    ]))).one()
+    
+    if sentiment_distribution is None:
+        sentiment_distribution = {
+            "positive": row.positive,
+            "neutral": row.neutral,
+            "negative": row.negative
+        }
+        await set_cached_sentiment_counts(current_user.organization_id, sentiment_distribution, sentiment_version)
     
-    return DashboardStats(
-        total_employees=total_employees,
-        total_feedback=total_feedback,
-        pending_invitations=pending_invitations,
-        sentiment_distribution=sentiment_dist
-    )
+    return {
+        "total_employees": row.total_employees,
+        "total_feedback": row.total_feedback,
+        "pending_invitations": row.pending_invitations,
+        "sentiment_distribution": sentiment_distribution
+    }
 
 @app.get("/")
-def health_check():
+async def health_check():
     return {"status": "ok", "version": "2.0.0", "features": ["multi-tenant", "postgresql"]}
 
 if __name__ == "__main__":
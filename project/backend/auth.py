@@ -1,13 +1,25 @@
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Optional
+from cachetools import TTLCache
+import threading
+import asyncio
+import time
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from redis.exceptions import RedisError
+import orjson
 import jwt
 import bcrypt
 import secrets
 import os
 
+from cache import redis_client
 from database import get_db
 from models import User, Organization, Invitation
 
@@ -16,58 +28,217 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Key, algorithm list and decoder are built once instead of on every request
+_SECRET_KEY_BYTES = SECRET_KEY.encode('utf-8')
+_JWT_ALGORITHMS = (ALGORITHM,)
+_jwt = jwt.PyJWT(options={"require": ["exp", "sub"], "verify_aud": False})
+
+# Verified payloads by token, so repeat requests skip signature verification until exp
+_token_cache = TTLCache(maxsize=10000, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+_token_cache_lock = threading.Lock()
+
+# Argon2id password hashing; bcrypt is only kept to verify legacy hashes
+_password_hasher = PasswordHasher(
+    time_cost=int(os.getenv("ARGON2_TIME_COST", "2")),
+    memory_cost=int(os.getenv("ARGON2_MEMORY_COST", str(64 * 1024))),  # KiB
+    parallelism=int(os.getenv("ARGON2_PARALLELISM", "4")),
+)
+
+# In-process cache of authenticated users, keyed by user id
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+_user_cache = TTLCache(maxsize=10000, ttl=USER_CACHE_TTL_SECONDS)
+_user_cache_lock = threading.Lock()
+
+# Redis copy of the same, shared by all workers; password hashes are never stored there
+_SHARED_USER_FIELDS = tuple(column.key for column in User.__table__.columns if column.key != "password_hash")
+_SHARED_USER_TTL_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# last_login is only rewritten once it is older than this, so reads stay read-only
+LAST_LOGIN_UPDATE_INTERVAL = timedelta(minutes=int(os.getenv("LAST_LOGIN_UPDATE_MINUTES", "5")))
+
+# Process pool for password hashing so it runs on all cores without blocking the event loop
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(os.cpu_count() or 1)))
+_password_pool: Optional[ProcessPoolExecutor] = None
+
 security = HTTPBearer()
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return _password_hasher.hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    if hashed.startswith("$2"):
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    try:
+        return _password_hasher.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def password_needs_rehash(hashed: str) -> bool:
+    """True for legacy bcrypt hashes and argon2 hashes made with older parameters"""
+    return hashed.startswith("$2") or _password_hasher.check_needs_rehash(hashed)
+
+def start_password_pool():
+    global _password_pool
+    if _password_pool is None:
+        _password_pool = ProcessPoolExecutor(max_workers=PASSWORD_POOL_WORKERS)
+
+def stop_password_pool():
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown()
+        _password_pool = None
+
+async def hash_password_async(password: str) -> str:
+    """hash_password offloaded to the password pool (default executor if not started)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_pool, hash_password, password)
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """verify_password offloaded to the password pool (default executor if not started)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_pool, verify_password, password, hashed)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return _jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
+
+def decode_access_token(token: str) -> dict:
+    with _token_cache_lock:
+        payload = _token_cache.get(token)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+    payload = _jwt.decode(token, _SECRET_KEY_BYTES, algorithms=_JWT_ALGORITHMS)
+    with _token_cache_lock:
+        _token_cache[token] = payload
+    return payload
 
 def generate_invitation_token() -> str:
     return secrets.token_urlsafe(32)
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_db)):
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(credentials.credentials)
         user_id: int = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
+    with _user_cache_lock:
+        user = _user_cache.get(user_id)
+    if user is None:
+        user = await _get_shared_cached_user(user_id)
+        if user is not None:
+            with _user_cache_lock:
+                _user_cache[user_id] = user
+    if user is not None:
+        # Scope every later query in this request to the user's organization
+        db.info["organization_id"] = user.organization_id
+        return user
+    
+    user = await db.scalar(select(User).where(User.id == user_id, User.is_active == True))
     if user is None:
         raise HTTPException(status_code=401, detail="User not found or inactive")
     
-    # Update last login
-    user.last_login = datetime.utcnow()
-    db.commit()
+    # Update last login (throttled)
+    now = datetime.now(timezone.utc)
+    last_login = user.last_login
+    if last_login is not None and last_login.tzinfo is None:
+        last_login = last_login.replace(tzinfo=timezone.utc)  # SQLite returns naive UTC values
+    if last_login is None or now - last_login > LAST_LOGIN_UPDATE_INTERVAL:
+        user.last_login = now
+        await db.commit()
+    
+    # Cache a detached copy so later requests skip the lookup
+    db.expunge(user)
+    with _user_cache_lock:
+        _user_cache[user_id] = user
+    await _set_shared_cached_user(user)
     
+    db.info["organization_id"] = user.organization_id
     return user
 
+async def _get_shared_cached_user(user_id) -> Optional[User]:
+    if redis_client is None:
+        return None
+    try:
+        raw = await redis_client.get(f"user:{user_id}")
+    except RedisError:
+        return None
+    if raw is None:
+        return None
+    # Entries written by another release may have different fields; treat those as a miss
+    try:
+        data = orjson.loads(raw)
+        data = {field: data[field] for field in _SHARED_USER_FIELDS}
+        for field in ("created_at", "last_login"):
+            if data[field] is not None:
+                data[field] = datetime.fromisoformat(data[field])
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+    # Detached with its identity key, like the in-process copy: a session that merges or adds
+    # it treats it as the existing row instead of inserting a new one
+    user = User(**data)
+    make_transient_to_detached(user)
+    return user
+
+async def _set_shared_cached_user(user: User):
+    if redis_client is None:
+        return
+    data = {field: getattr(user, field) for field in _SHARED_USER_FIELDS}
+    try:
+        await redis_client.set(f"user:{user.id}", orjson.dumps(data), ex=_SHARED_USER_TTL_SECONDS)
+    except RedisError:
+        pass
+
+async def invalidate_cached_user(user_id: int):
+    """Drop a user from the authentication caches after role/status changes"""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+    if redis_client is not None:
+        try:
+            await redis_client.delete(f"user:{user_id}")
+        except RedisError:
+            pass
+
+# One checker per distinct role set, shared by every endpoint that asks for it
+_role_checkers = {}
+
 def require_role(allowed_roles: list):
-    def role_checker(current_user: User = Depends(get_current_user)):
-        if current_user.role not in allowed_roles:
-            raise HTTPException(
-                status_code=403, 
-                detail=f"Access denied. Required roles: {', '.join(allowed_roles)}"
-            )
+    key = frozenset(allowed_roles)
+    role_checker = _role_checkers.get(key)
+    if role_checker is not None:
+        return role_checker
+    
+    detail = f"Access denied. Required roles: {', '.join(allowed_roles)}"
+    
+    async def role_checker(current_user: User = Depends(get_current_user)):
+        if current_user.role not in key:
+            raise HTTPException(status_code=403, detail=detail)
         return current_user
+    
+    _role_checkers[key] = role_checker
     return role_checker
 
-def require_same_organization(target_user_id: int, current_user: User, db: Session):
-    target_user = db.query(User).filter(User.id == target_user_id).first()
-    if not target_user or target_user.organization_id != current_user.organization_id:
+async def require_same_organization(target_user_id: int, current_user: User, db: AsyncSession):
+    target_user = await db.scalar(select(User).where(
+        User.id == target_user_id,
+        User.organization_id == current_user.organization_id
+    ))
+    if not target_user:
         raise HTTPException(status_code=403, detail="Access denied to user from different organization")
     return target_user
 
+async def get_subordinates(manager_id: int, db: AsyncSession):
+    """Everyone below manager_id in the reporting tree, fetched with one recursive CTE"""
+    subordinates = select(User.id).where(User.manager_id == manager_id).cte("subordinates", recursive=True)
+    subordinates = subordinates.union_all(
+        select(User.id).join(subordinates, User.manager_id == subordinates.c.id)
+    )
+    return (await db.scalars(select(User).where(User.id.in_(select(subordinates.c.id))))).all()
+
 def can_manage_user(current_user: User, target_user: User) -> bool:
     """Check if current user can manage target user"""
     if current_user.role in ['owner', 'admin']:
@@ -0,0 +1,80 @@
+from cachetools import TTLCache
+from redis.exceptions import RedisError
+from typing import Dict, Optional, Tuple
+import redis.asyncio as redis
+import time
+import os
+
+# Shared cache across workers; callers fall back to in-process state when REDIS_URL is unset
+REDIS_URL = os.getenv("REDIS_URL")
+redis_client = redis.from_url(REDIS_URL) if REDIS_URL else None
+
+# Short TTL bounds how long a missed invalidation (Redis briefly down) can serve stale counts
+SENTIMENT_COUNTS_TTL_SECONDS = 300
+
+async def close_redis():
+    if redis_client is not None:
+        await redis_client.aclose()
+
+# Counts are stored under a per-organization version that every invalidation bumps, so a fill
+# computed before a concurrent insert committed lands on a key nobody reads any more
+def _sentiment_counts_key(organization_id: int, version: str) -> str:
+    return f"org:{organization_id}:sentiment_counts:{version}"
+
+async def get_cached_sentiment_counts(organization_id: int) -> Tuple[Optional[Dict[str, int]], Optional[str]]:
+    """Cached counts (None on a miss) and the version to hand to set_cached_sentiment_counts"""
+    if redis_client is None:
+        return None, None
+    try:
+        version = (await redis_client.get(f"org:{organization_id}:sentiment_version") or b"0").decode()
+        counts = await redis_client.hgetall(_sentiment_counts_key(organization_id, version))
+    except RedisError:
+        return None, None
+    return {key.decode(): int(value) for key, value in counts.items()} or None, version
+
+async def set_cached_sentiment_counts(organization_id: int, counts: Dict[str, int], version: Optional[str]):
+    """Fill the cache; version must be the one read before the counts were queried"""
+    if redis_client is None or version is None:
+        return
+    key = _sentiment_counts_key(organization_id, version)
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            await pipe.hset(key, mapping=counts).expire(key, SENTIMENT_COUNTS_TTL_SECONDS).execute()
+    except RedisError:
+        pass
+
+async def invalidate_sentiment_counts(organization_id: int):
+    """Call after committing feedback changes; the next dashboard read recomputes the counts"""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.incr(f"org:{organization_id}:sentiment_version")
+    except RedisError:
+        pass  # The write is committed; the short TTL bounds the staleness
+
+class RateLimiter:
+    """Fixed-window hit counter per key, kept in Redis when reachable and per process otherwise"""
+
+    def __init__(self, name: str, limit: int, window_seconds: int):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        # key -> (window start, hits); the TTL only evicts, windows are tracked by the start time
+        self._local = TTLCache(maxsize=10000, ttl=window_seconds)
+
+    async def hit(self, key: str) -> bool:
+        """Record a hit for key; False once the limit for the window is exceeded"""
+        if redis_client is not None:
+            redis_key = f"ratelimit:{self.name}:{key}"
+            try:
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    _, count = await pipe.set(redis_key, 0, ex=self.window_seconds, nx=True).incr(redis_key).execute()
+                return count <= self.limit
+            except RedisError:
+                pass
+        now = time.monotonic()
+        window_start, count = self._local.get(key, (now, 0))
+        if now - window_start >= self.window_seconds:
+            window_start, count = now, 0
+        self._local[key] = (window_start, count + 1)
+        return count + 1 <= self.limit
@@ -0,0 +1,59 @@
+from starlette.datastructures import Headers, MutableHeaders
+from typing import Dict
+import hashlib
+
+class ETagMiddleware:
+    """Add weak ETags to successful GET responses and answer If-None-Match with 304"""
+
+    def __init__(self, app, cache_control: Dict[str, str] = None, default_cache_control: str = "private, no-cache"):
+        self.app = app
+        self.cache_control = cache_control or {}
+        self.default_cache_control = default_cache_control
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message = None
+        body = []
+
+        async def send_with_etag(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            content = b"".join(body)
+            headers = MutableHeaders(scope=start_message)
+            if start_message["status"] == 200 and "etag" not in headers:
+                etag = 'W/"%s"' % hashlib.blake2b(content, digest_size=16).hexdigest()
+                headers["ETag"] = etag
+                headers.setdefault("Cache-Control", self.cache_control.get(scope["path"], self.default_cache_control))
+                headers.add_vary_header("Authorization")
+
+                if if_none_match and _etag_matches(etag, if_none_match):
+                    start_message["status"] = 304
+                    del headers["content-length"]
+                    del headers["content-type"]
+                    content = b""
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": content})
+
+        await self.app(scope, receive, send_with_etag)
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """Weak comparison as required for If-None-Match"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
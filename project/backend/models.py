@@ -1,67 +1,99 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, UniqueConstraint
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from datetime import datetime
-import os
+from sqlalchemy import event, func, case, inspect, select, Column, Integer, SmallInteger, String, Text, DateTime, Boolean, ForeignKey, JSON, UniqueConstraint, CheckConstraint, Index
+from sqlalchemy.orm import Session, declarative_base, deferred, relationship
+from sqlalchemy.dialects.postgresql import ARRAY, insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from enum import IntEnum
 
 Base = declarative_base()
 
+class Sentiment(IntEnum):
+    """Feedback sentiment as stored in feedback.sentiment_score; the API uses the lowercase names"""
+    NEGATIVE = 0
+    NEUTRAL = 1
+    POSITIVE = 2
+
 class Organization(Base):
     __tablename__ = "organizations"
+    # Server defaults come back via INSERT/UPDATE ... RETURNING, not a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
     domain = Column(String, nullable=True)  # Optional email domain for auto-assignment
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=True)
     
-    # Relationships
-    users = relationship("User", back_populates="organization")
-    invitations = relationship("Invitation", back_populates="organization")
+    # Relationships (never loaded implicitly; use .options() where needed)
+    users = relationship("User", back_populates="organization", lazy="raise")
+    invitations = relationship("Invitation", back_populates="organization", lazy="raise")
 
 class User(Base):
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, index=True)
-    name = Column(String)
-    password_hash = Column(String)
-    role = Column(String)  # 'owner', 'admin', 'manager', 'employee'
+    email = Column(String(254), index=True)
+    name = Column(String(120))
+    password_hash = deferred(Column(String), raiseload=True)  # Only login needs it: .options(undefer(...))
+    role = Column(String(16), nullable=False)
     organization_id = Column(Integer, ForeignKey("organizations.id"))
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    last_login = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_login = Column(DateTime(timezone=True), nullable=True)
     
     # Unique constraint for email within organization
-    __table_args__ = (UniqueConstraint('email', 'organization_id', name='unique_email_per_org'),)
+    __table_args__ = (
+        UniqueConstraint('email', 'organization_id', name='unique_email_per_org'),
+        Index('ix_users_manager', 'manager_id'),
+        Index('ix_users_org_manager', 'organization_id', 'manager_id'),
+        Index('ix_users_org_role', 'organization_id', 'role'),
+        CheckConstraint("role IN ('owner', 'admin', 'manager', 'employee')", name='ck_user_role'),
+    )
     
     # Relationships
-    organization = relationship("Organization", back_populates="users")
-    manager = relationship("User", remote_side=[id], back_populates="employees")
-    employees = relationship("User", back_populates="manager")
-    given_feedback = relationship("Feedback", foreign_keys="Feedback.manager_id", back_populates="manager")
-    received_feedback = relationship("Feedback", foreign_keys="Feedback.employee_id", back_populates="employee")
+    organization = relationship("Organization", back_populates="users", lazy="raise")
+    # Collections must be loaded explicitly with .options(selectinload(...)) to avoid accidental
+    # N+1s; joinedload on a collection multiplies parent rows by the collection size. The
+    # hierarchy is walked with auth.get_subordinates (one recursive query), never attribute by attribute
+    manager = relationship("User", remote_side=[id], back_populates="employees", lazy="raise")
+    employees = relationship("User", back_populates="manager", lazy="raise")
+    given_feedback = relationship("Feedback", foreign_keys="Feedback.manager_id", back_populates="manager", lazy="raise")
+    received_feedback = relationship("Feedback", foreign_keys="Feedback.employee_id", back_populates="employee", lazy="raise")
 
 class Invitation(Base):
     __tablename__ = "invitations"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, index=True)
+    email = Column(String(254), index=True)
     organization_id = Column(Integer, ForeignKey("organizations.id"))
     invited_by_id = Column(Integer, ForeignKey("users.id"))
-    role = Column(String)  # Role to assign when invitation is accepted
-    token = Column(String, unique=True, index=True)
-    expires_at = Column(DateTime)
-    accepted_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    role = Column(String(16), nullable=False)  # Role to assign when invitation is accepted
+    token = Column(String(43), nullable=False, unique=True, index=True)  # secrets.token_urlsafe(32)
+    expires_at = Column(DateTime(timezone=True))
+    accepted_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Partial index over live invitations only (expiry is checked against the indexed column)
+    __table_args__ = (
+        Index('ix_invitations_pending', organization_id, expires_at,
+              postgresql_where=accepted_at.is_(None), sqlite_where=accepted_at.is_(None)),
+        CheckConstraint("role IN ('owner', 'admin', 'manager', 'employee')", name='ck_invitation_role'),
+    )
     
     # Relationships
-    organization = relationship("Organization", back_populates="invitations")
-    invited_by = relationship("User")
+    organization = relationship("Organization", back_populates="invitations", lazy="raise")
+    # Must be eager-loaded (list_invitations joins it); a lazy load per row would be an N+1
+    invited_by = relationship("User", lazy="raise")
+    
+    @property
+    def invited_by_name(self):
+        return self.invited_by.name
 
 class Feedback(Base):
     __tablename__ = "feedback"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("users.id"))
@@ -69,14 +101,123 @@ class Feedback(Base):
     organization_id = Column(Integer, ForeignKey("organizations.id"))  # For data isolation
     strengths = Column(Text)
     improvements = Column(Text)
-    sentiment = Column(String)  # 'positive', 'neutral', 'negative'
-    tags = Column(JSON, default=list)
+    sentiment_score = Column(SmallInteger, nullable=False, server_default="1")  # A Sentiment value
+    tags = Column(ARRAY(Text).with_variant(JSON(), "sqlite"), default=list)  # text[] on PostgreSQL
     acknowledged = Column(Boolean, default=False)
     employee_comment = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Composite indexes matching the hot feedback lookups
+    __table_args__ = (
+        Index('ix_feedback_employee_created', employee_id, created_at.desc()),
+        Index('ix_feedback_manager_sentiment', manager_id, sentiment_score),
+        Index('ix_feedback_org_manager_employee', organization_id, manager_id, employee_id),
+        # Partial index: only unacknowledged feedback is indexed
+        Index('ix_feedback_pending', employee_id,
+              postgresql_where=acknowledged == False, sqlite_where=acknowledged == False),
+        # Tag containment lookups; SQLite keeps tags as JSON and gets no index
+        Index('ix_feedback_tags_gin', tags, postgresql_using='gin').ddl_if(dialect='postgresql'),
+        CheckConstraint('sentiment_score BETWEEN 0 AND 2', name='ck_feedback_sentiment_score'),
+    )
     
     # Relationships
-    employee = relationship("User", foreign_keys=[employee_id], back_populates="received_feedback")
-    manager = relationship("User", foreign_keys=[manager_id], back_populates="given_feedback")
-    organization = relationship("Organization")
\ No newline at end of file
+    # Almost always dereferenced when serialising, so load them in the same query
+    employee = relationship("User", foreign_keys=[employee_id], back_populates="received_feedback", lazy="joined")
+    manager = relationship("User", foreign_keys=[manager_id], back_populates="given_feedback", lazy="joined")
+    organization = relationship("Organization", lazy="raise")
+    
+    @property
+    def sentiment(self):
+        return Sentiment(self.sentiment_score).name.lower()
+    
+    @sentiment.setter
+    def sentiment(self, label):
+        self.sentiment_score = int(Sentiment[label.upper()])
+    
+    @property
+    def employee_name(self):
+        return self.employee.name
+    
+    @property
+    def manager_name(self):
+        return self.manager.name
+
+class EmployeeFeedbackSummary(Base):
+    """Per-employee feedback counters, updated in the same flush as feedback inserts.
+    
+    Insert-only: no endpoint deletes feedback or changes its sentiment, so nothing is subtracted.
+    """
+    __tablename__ = "employee_feedback_summary"
+    
+    employee_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    feedback_count = Column(Integer, nullable=False, default=0)
+    sentiment_score_total = Column(Integer, nullable=False, default=0)  # Sum of Sentiment values
+    positive_count = Column(Integer, nullable=False, default=0)
+    neutral_count = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+    last_feedback_at = Column(DateTime(timezone=True), nullable=True)
+
+_SUMMARY_COUNTERS = ("feedback_count", "sentiment_score_total", "positive_count", "neutral_count", "negative_count")
+
+# The engine only accepts these backends (see database.get_async_url)
+_SUMMARY_UPSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+@event.listens_for(Session, "after_flush")
+def _add_to_feedback_summary(session, flush_context):
+    # One multi-row upsert per flush, in the flush's transaction: a bulk insert costs a single
+    # extra statement, and concurrent inserts for one employee can't lose counts
+    deltas = {}
+    for feedback in session.new:
+        if not isinstance(feedback, Feedback) or feedback.employee_id is None:
+            continue
+        delta = deltas.setdefault(feedback.employee_id, {
+            "employee_id": feedback.employee_id,
+            "organization_id": feedback.organization_id,
+            **dict.fromkeys(_SUMMARY_COUNTERS, 0),
+        })
+        delta["feedback_count"] += 1
+        delta["sentiment_score_total"] += feedback.sentiment_score
+        delta[f"{feedback.sentiment}_count"] += 1
+    if not deltas:
+        return
+    
+    connection = session.connection()
+    summary = EmployeeFeedbackSummary.__table__
+    # Ordered by key so concurrent flushes lock summary rows in the same order
+    stmt = _SUMMARY_UPSERTS[connection.dialect.name](summary).values([
+        {**delta, "last_feedback_at": func.now()} for _, delta in sorted(deltas.items())
+    ])
+    updates = {name: summary.c[name] + stmt.excluded[name] for name in _SUMMARY_COUNTERS}
+    if connection.dialect.name == "postgresql":
+        updates["last_feedback_at"] = func.greatest(summary.c.last_feedback_at, stmt.excluded.last_feedback_at)
+    else:
+        # SQLite's scalar max() returns NULL if any argument is NULL
+        updates["last_feedback_at"] = func.max(
+            func.coalesce(summary.c.last_feedback_at, stmt.excluded.last_feedback_at), stmt.excluded.last_feedback_at
+        )
+    connection.execute(stmt.on_conflict_do_update(index_elements=[summary.c.employee_id], set_=updates))
+
+@event.listens_for(EmployeeFeedbackSummary.__table__, "after_create")
+def _backfill_feedback_summary(summary, connection, **kw):
+    # create_all on an existing database (AUTO_CREATE_TABLES) must count feedback that predates
+    # the table, as Alembic's 0008 backfill does
+    if not inspect(connection).has_table(Feedback.__tablename__):
+        return
+    feedback = Feedback.__table__
+    score = feedback.c.sentiment_score
+    connection.execute(summary.insert().from_select(
+        ["employee_id", "organization_id", *_SUMMARY_COUNTERS, "last_feedback_at"],
+        select(
+            feedback.c.employee_id,
+            func.min(feedback.c.organization_id),
+            func.count(),
+            func.sum(score),
+            *[func.sum(case((score == sentiment, 1), else_=0))
+              for sentiment in (Sentiment.POSITIVE, Sentiment.NEUTRAL, Sentiment.NEGATIVE)],
+            func.max(feedback.c.created_at),
+        ).where(
+            feedback.c.employee_id.isnot(None), feedback.c.organization_id.isnot(None)
+        ).group_by(feedback.c.employee_id)
+    ))
@@ -1,13 +1,23 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter, field_validator
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
+from typing_extensions import Annotated, TypedDict
+
+class ORMResponse(BaseModel):
+    """Base for response models read from ORM objects; immutable once built"""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    @classmethod
+    def from_orm_trusted(cls, obj):
+        """Build from an already-typed ORM object without re-running validation"""
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
 
 # Organization schemas
 class OrganizationCreate(BaseModel):
     name: str
     domain: Optional[str] = None
 
-class OrganizationResponse(BaseModel):
+class OrganizationResponse(ORMResponse):
     id: int
     name: str
     domain: Optional[str]
@@ -15,11 +25,13 @@ class OrganizationResponse(BaseModel):
     is_active: bool
 
 # User schemas
+Role = Literal["owner", "admin", "manager", "employee"]
+
 class UserCreate(BaseModel):
     email: EmailStr
-    name: str
+    name: str = Field(max_length=120)
     password: str
-    role: str
+    role: Role
     manager_id: Optional[int] = None
 
 class UserLogin(BaseModel):
@@ -27,31 +39,31 @@ class UserLogin(BaseModel):
     password: str
     organization_id: Optional[int] = None
 
-class UserResponse(BaseModel):
+class UserResponse(ORMResponse):
     id: int
     email: str
     name: str
-    role: str
+    role: Role
     organization_id: int
     manager_id: Optional[int] = None
     is_active: bool
     last_login: Optional[datetime] = None
 
 class UserUpdate(BaseModel):
-    name: Optional[str] = None
-    role: Optional[str] = None
+    name: Optional[str] = Field(default=None, max_length=120)
+    role: Optional[Role] = None
     manager_id: Optional[int] = None
     is_active: Optional[bool] = None
 
 # Invitation schemas
 class InvitationCreate(BaseModel):
     email: EmailStr
-    role: str
+    role: Role
 
-class InvitationResponse(BaseModel):
+class InvitationResponse(ORMResponse):
     id: int
     email: str
-    role: str
+    role: Role
     expires_at: datetime
     accepted_at: Optional[datetime]
     created_at: datetime
@@ -59,31 +71,37 @@ class InvitationResponse(BaseModel):
 
 class InvitationAccept(BaseModel):
     token: str
-    name: str
+    name: str = Field(max_length=120)
     password: str
 
 # Feedback schemas
+SentimentLabel = Literal["positive", "neutral", "negative"]
+
 class FeedbackCreate(BaseModel):
     employee_id: int
     strengths: str
     improvements: str
-    sentiment: str
+    sentiment: SentimentLabel
     tags: List[str] = []
 
+# Built once: validates a whole bulk payload in a single pydantic-core call
+FEEDBACK_BULK_MAX_ITEMS = 100
+FeedbackCreateListAdapter = TypeAdapter(Annotated[List[FeedbackCreate], Field(max_length=FEEDBACK_BULK_MAX_ITEMS)])
+
 class FeedbackUpdate(BaseModel):
     strengths: str
     improvements: str
-    sentiment: str
+    sentiment: SentimentLabel
     tags: List[str] = []
 
-class FeedbackResponse(BaseModel):
+class FeedbackResponse(ORMResponse):
     id: int
     employee_id: int
     manager_id: int
     organization_id: int
     strengths: str
     improvements: str
-    sentiment: str
+    sentiment: SentimentLabel
     tags: List[str]
     acknowledged: bool
     employee_comment: Optional[str]
@@ -91,12 +109,25 @@ class FeedbackResponse(BaseModel):
     updated_at: datetime
     employee_name: str
     manager_name: str
+    
+    @field_validator("tags", mode="before")
+    @classmethod
+    def default_tags(cls, v):
+        return v or []
+    
+    @classmethod
+    def from_orm_trusted(cls, obj):
+        # model_construct skips default_tags, so apply it here
+        values = {name: getattr(obj, name) for name in cls.model_fields}
+        values["tags"] = values["tags"] or []
+        return cls.model_construct(**values)
 
-class EmployeeResponse(BaseModel):
+# Response-only shapes are TypedDicts: served as plain dicts, no model instances per row
+class EmployeeResponse(TypedDict):
     id: int
     name: str
     email: str
-    role: str
+    role: Role
     is_active: bool
     feedback_count: int
     last_feedback_date: Optional[datetime]
@@ -105,8 +136,21 @@ class EmployeeResponse(BaseModel):
 class CommentCreate(BaseModel):
     comment: str
 
+class SentimentDistribution(TypedDict):
+    positive: int
+    neutral: int
+    negative: int
+
 class DashboardStats(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     total_employees: int
     total_feedback: int
     pending_invitations: int
-    sentiment_distribution: dict
\ No newline at end of file
+    sentiment_distribution: SentimentDistribution
+
+# Built once for the list endpoints, which encode already-built models straight to JSON bytes
+UserResponseListAdapter = TypeAdapter(List[UserResponse])
+InvitationResponseListAdapter = TypeAdapter(List[InvitationResponse])
+FeedbackResponseListAdapter = TypeAdapter(List[FeedbackResponse])
+EmployeeResponseListAdapter = TypeAdapter(List[EmployeeResponse])
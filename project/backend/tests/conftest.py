@@ -0,0 +1,25 @@
+import os
+import tempfile
+
+# Configure before the app modules are imported: they read these at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["AUTO_CREATE_TABLES"] = "1"
+os.environ["ARGON2_MEMORY_COST"] = "1024"
+os.environ.pop("REDIS_URL", None)
+
+import pytest
+from fastapi.testclient import TestClient
+
+@pytest.fixture(scope="session")
+def client():
+    from app import app
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def login(client):
+    def login(email, password="password123"):
+        response = client.post("/api/auth/login", json={"email": email, "password": password})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['token']}"}
+    return login
@@ -0,0 +1,75 @@
+import pytest
+
+from schemas import FEEDBACK_BULK_MAX_ITEMS
+
+def feedback_item(employee_id, sentiment="positive"):
+    return {"employee_id": employee_id, "strengths": "Clear writing", "improvements": "Estimates", "sentiment": sentiment}
+
+@pytest.fixture
+def manager(login):
+    return login("manager@demo.com")
+
+@pytest.fixture
+def employee(client, manager):
+    employees = client.get("/api/employees", headers=manager).json()
+    return next(e for e in employees if e["email"] == "employee@demo.com")
+
+def feedback_count(client, manager, employee_id):
+    employees = client.get("/api/employees", headers=manager).json()
+    return next(e["feedback_count"] for e in employees if e["id"] == employee_id)
+
+def test_bulk_create_feedback(client, manager, employee):
+    before = feedback_count(client, manager, employee["id"])
+    
+    response = client.post("/api/feedback/bulk", headers=manager, json=[
+        feedback_item(employee["id"], "positive"),
+        feedback_item(employee["id"], "negative"),
+    ])
+    
+    assert response.status_code == 200, response.text
+    ids = response.json()["ids"]
+    assert len(ids) == 2
+    created = [client.get(f"/api/feedback/{feedback_id}", headers=manager).json() for feedback_id in ids]
+    assert [feedback["sentiment"] for feedback in created] == ["positive", "negative"]
+    assert feedback_count(client, manager, employee["id"]) == before + 2
+
+def test_bulk_rejects_employee_from_other_organization(client, manager, employee):
+    organization = client.post("/api/organizations", json={"name": "Other Company"}).json()
+    registered = client.post(f"/api/auth/register?organization_id={organization['id']}", json={
+        "email": "owner@other.com", "name": "Other Owner", "password": "password123", "role": "owner"
+    })
+    assert registered.status_code == 200, registered.text
+    outsider_id = registered.json()["user"]["id"]
+    before = feedback_count(client, manager, employee["id"])
+    
+    response = client.post("/api/feedback/bulk", headers=manager, json=[
+        feedback_item(employee["id"]),
+        feedback_item(outsider_id),
+    ])
+    
+    assert response.status_code == 403
+    assert feedback_count(client, manager, employee["id"]) == before
+
+def test_bulk_rejects_malformed_payload(client, manager, employee):
+    response = client.post("/api/feedback/bulk", headers=manager, json=[
+        feedback_item(employee["id"]),
+        {"employee_id": employee["id"], "strengths": "Missing the rest"},
+    ])
+    assert response.status_code == 422
+    assert all(error["loc"][:2] == ["body", 1] for error in response.json()["detail"])
+    
+    response = client.post("/api/feedback/bulk", headers={**manager, "Content-Type": "application/json"},
+                           content=b"[{not json")
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][0] == "body"
+
+def test_bulk_rejects_oversized_payload(client, manager, employee):
+    before = feedback_count(client, manager, employee["id"])
+    
+    response = client.post("/api/feedback/bulk", headers=manager,
+                           json=[feedback_item(employee["id"])] * (FEEDBACK_BULK_MAX_ITEMS + 1))
+    
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+    assert response.json()["detail"][0]["loc"] == ["body"]
+    assert feedback_count(client, manager, employee["id"]) == before
@@ -0,0 +1,33 @@
+from sqlalchemy import event
+
+from database import engine
+
+def test_bulk_insert_updates_summary_in_one_statement(client, login):
+    manager = login("manager@demo.com")
+    employee = next(e for e in client.get("/api/employees", headers=manager).json() if e["email"] == "employee@demo.com")
+    before = client.get("/api/dashboard/stats", headers=manager).json()["sentiment_distribution"]
+    
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "employee_feedback_summary" in statement:
+            statements.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.post("/api/feedback/bulk", headers=manager, json=[
+            {"employee_id": employee["id"], "strengths": "s", "improvements": "i", "sentiment": sentiment}
+            for sentiment in ("positive", "positive", "neutral", "negative")
+        ])
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    
+    assert response.status_code == 200, response.text
+    assert len(statements) == 1
+    after = client.get("/api/dashboard/stats", headers=manager).json()["sentiment_distribution"]
+    assert after == {
+        "positive": before["positive"] + 2,
+        "neutral": before["neutral"] + 1,
+        "negative": before["negative"] + 1,
+    }
+    updated = next(e for e in client.get("/api/employees", headers=manager).json() if e["id"] == employee["id"])
+    assert updated["feedback_count"] == employee["feedback_count"] + 4
+    assert updated["last_feedback_date"] is not None
@@ -0,0 +1,53 @@
+import pytest
+
+from auth import get_subordinates
+from database import SessionLocal
+from models import Organization, User
+
+async def build_trees():
+    """Two organizations, each with a three-level reporting chain under one owner"""
+    async with SessionLocal() as db:
+        ids = {}
+        for org_name in ("Tree Org", "Other Tree Org"):
+            organization = Organization(name=org_name)
+            db.add(organization)
+            await db.flush()
+            owner = User(email=f"owner@{org_name}", name="Owner", role="owner", organization_id=organization.id)
+            db.add(owner)
+            await db.flush()
+            manager = User(email=f"manager@{org_name}", name="Manager", role="manager",
+                           organization_id=organization.id, manager_id=owner.id)
+            peer = User(email=f"peer@{org_name}", name="Peer", role="employee",
+                        organization_id=organization.id, manager_id=owner.id)
+            db.add_all([manager, peer])
+            await db.flush()
+            employee = User(email=f"employee@{org_name}", name="Employee", role="employee",
+                            organization_id=organization.id, manager_id=manager.id)
+            db.add(employee)
+            await db.flush()
+            ids[org_name] = {"org": organization.id, "owner": owner.id, "manager": manager.id,
+                             "peer": peer.id, "employee": employee.id}
+        await db.commit()
+        return ids
+
+async def subordinate_ids(manager_id, organization_id):
+    async with SessionLocal() as db:
+        db.info["organization_id"] = organization_id
+        return {user.id for user in await get_subordinates(manager_id, db)}
+
+@pytest.fixture(scope="module")
+def trees(client):
+    return client.portal.call(build_trees)
+
+def test_get_subordinates_returns_whole_subtree(client, trees):
+    tree = trees["Tree Org"]
+    
+    assert client.portal.call(subordinate_ids, tree["owner"], tree["org"]) == {tree["manager"], tree["peer"], tree["employee"]}
+    assert client.portal.call(subordinate_ids, tree["manager"], tree["org"]) == {tree["employee"]}
+    assert client.portal.call(subordinate_ids, tree["employee"], tree["org"]) == set()
+
+def test_get_subordinates_is_tenant_scoped(client, trees):
+    other = trees["Other Tree Org"]
+    
+    assert client.portal.call(subordinate_ids, other["owner"], trees["Tree Org"]["org"]) == set()
+    assert len(client.portal.call(subordinate_ids, other["owner"], other["org"])) == 3
@@ -0,0 +1,30 @@
+import bcrypt
+from sqlalchemy import select
+
+from database import SessionLocal
+from models import Organization, User
+
+async def create_legacy_user(email, password):
+    async with SessionLocal() as db:
+        organization = await db.scalar(select(Organization).where(Organization.name == "Demo Company"))
+        legacy_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
+        db.add(User(email=email, name="Legacy User", role="employee", organization_id=organization.id,
+                    password_hash=legacy_hash, is_active=True))
+        await db.commit()
+        return legacy_hash
+
+async def stored_hash(email):
+    async with SessionLocal() as db:
+        return await db.scalar(select(User.password_hash).where(User.email == email))
+
+def test_login_upgrades_bcrypt_hash_to_argon2id(client, login):
+    legacy_hash = client.portal.call(create_legacy_user, "legacy@demo.com", "old-password")
+    assert legacy_hash.startswith("$2b$")
+    
+    login("legacy@demo.com", "old-password")
+    
+    upgraded_hash = client.portal.call(stored_hash, "legacy@demo.com")
+    assert upgraded_hash.startswith("$argon2id$")
+    # The new hash still accepts the same password
+    login("legacy@demo.com", "old-password")
+    assert client.portal.call(stored_hash, "legacy@demo.com") == upgraded_hash
@@ -0,0 +1,70 @@
+import fakeredis.aioredis
+import orjson
+import pytest
+from sqlalchemy import inspect, select
+
+import auth
+from database import SessionLocal
+from models import Organization, User
+
+async def new_fake_redis():
+    return fakeredis.aioredis.FakeRedis()
+
+@pytest.fixture
+def shared_cache(client, monkeypatch):
+    fake = client.portal.call(new_fake_redis)
+    monkeypatch.setattr(auth, "redis_client", fake)
+    auth._user_cache.clear()
+    yield fake
+    auth._user_cache.clear()
+
+async def create_user(email, password):
+    async with SessionLocal() as db:
+        organization = await db.scalar(select(Organization).where(Organization.name == "Demo Company"))
+        user = User(email=email, name="Cached User", role="employee", organization_id=organization.id,
+                    password_hash=auth.hash_password(password), is_active=True)
+        db.add(user)
+        await db.commit()
+        return user.id
+
+def test_user_lookup_falls_back_from_process_to_redis_to_db(client, login, shared_cache):
+    headers = login("owner@demo.com")
+    
+    # Miss everywhere: loaded from the database and written to Redis without the password hash
+    me = client.get("/api/auth/me", headers=headers).json()
+    cached = orjson.loads(client.portal.call(shared_cache.get, f"user:{me['id']}"))
+    assert cached["email"] == "owner@demo.com"
+    assert "password_hash" not in cached
+    
+    # Process cache cleared: served from Redis, as a detached instance
+    client.portal.call(shared_cache.set, f"user:{me['id']}", orjson.dumps({**cached, "name": "From Redis"}))
+    auth._user_cache.clear()
+    assert client.get("/api/auth/me", headers=headers).json()["name"] == "From Redis"
+    assert inspect(auth._user_cache[me["id"]]).detached
+    
+    # Both caches cleared: back to the database
+    client.portal.call(shared_cache.delete, f"user:{me['id']}")
+    auth._user_cache.clear()
+    assert client.get("/api/auth/me", headers=headers).json()["name"] == me["name"]
+
+def test_unreadable_redis_entry_is_a_miss(client, login, shared_cache):
+    headers = login("owner@demo.com")
+    me = client.get("/api/auth/me", headers=headers).json()
+    
+    client.portal.call(shared_cache.set, f"user:{me['id']}", orjson.dumps({"id": me["id"], "dropped_column": 1}))
+    auth._user_cache.clear()
+    
+    assert client.get("/api/auth/me", headers=headers).json()["email"] == "owner@demo.com"
+
+def test_deactivation_invalidates_cached_user(client, login, shared_cache):
+    user_id = client.portal.call(create_user, "cached@demo.com", "cached-password")
+    user_headers = login("cached@demo.com", "cached-password")
+    assert client.get("/api/auth/me", headers=user_headers).status_code == 200
+    assert client.portal.call(shared_cache.exists, f"user:{user_id}") == 1
+    
+    response = client.put(f"/api/users/{user_id}", headers=login("owner@demo.com"), json={"is_active": False})
+    
+    assert response.status_code == 200, response.text
+    assert client.portal.call(shared_cache.exists, f"user:{user_id}") == 0
+    assert user_id not in auth._user_cache
+    assert client.get("/api/auth/me", headers=user_headers).status_code == 401